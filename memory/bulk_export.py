@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+ReMemory: Bulk reconstruction / export
+Streams every memory cell of a store, reconstructs the texts in parallel batches
+and writes one JSON line per cell — for backups and for checking that all cells
+still decode (e.g. after a torch upgrade).
+
+Output record:
+    {"cell_id": "vec_0001", "status": "ok", "text": "...", "loss": 8.1e-06, "error": null}
+
+Status values:
+    ok             - reconstructed and decoded
+    decode_error   - the model ran but the token IDs are not valid base64/UTF-8
+    missing_vector - context_vector.json is missing
+    missing_model  - model.pt or model_config.json is missing
+    pending        - the model is still being trained (text comes from the pending file)
+    failed         - training the model failed (error comes from the failure marker)
+    orphaned       - pending, but the process training it is gone (a learn queue will retrain it)
+    error          - any other failure while loading or running the model
+
+Usage:
+    from memory.bulk_export import export_cells
+
+    summary = export_cells("memory_export.jsonl", batch_size=32, workers=4)
+"""
+
+import os
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Union, Sequence
+
+from memory.codec.base64_codec import decode_token_ids_to_text
+
+# ✅ Use shared project paths (no hardcoded directory)
+from memory.common_paths import PENDING_FILE, FAILED_FILE, resolve_cells_dirs
+from memory.cell_state import read_pending, is_orphaned
+
+DECODE_ERROR_PREFIX = "[Decoding error]"
+
+
+# -------------------- Single cell --------------------
+
+def iter_cell_dirs(cells_dirs: Optional[Sequence[Path]] = None) -> Iterator[Path]:
+    """Yield the directory of every memory cell across all shards, ordered by cell ID."""
+    cells: List[Path] = []
+    for root in resolve_cells_dirs(cells_dirs):
+        if not root.exists():
+            continue
+        cells += [root / d for d in os.listdir(root) if d.startswith("vec_") and (root / d).is_dir()]
+    cells.sort(key=lambda p: p.name)
+    yield from cells
+
+
+def reconstruct_cell(cell_dir: Path) -> Dict[str, Any]:
+    """
+    Reconstruct one cell and classify the outcome.
+
+    Args:
+        cell_dir: Directory of the memory cell.
+
+    Returns:
+        dict: cell_id, status, text, loss (final training loss from model_config.json), error.
+    """
+    cell_dir = Path(cell_dir)
+    record: Dict[str, Any] = {
+        "cell_id": cell_dir.name,
+        "status": "ok",
+        "text": None,
+        "loss": None,
+        "error": None,
+    }
+
+    config_path = cell_dir / "model_config.json"
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            record["loss"] = json.load(f).get("final_loss")
+    except Exception:
+        pass
+
+    if not (cell_dir / "context_vector.json").exists():
+        record["status"] = "missing_vector"
+        return record
+
+    if not (cell_dir / "model.pt").exists() or not config_path.exists():
+        pending_path = cell_dir / PENDING_FILE
+        failed_path = cell_dir / FAILED_FILE
+        if failed_path.exists():
+            record["status"] = "failed"
+            try:
+                with open(failed_path, "r", encoding="utf-8") as f:
+                    record["error"] = json.load(f).get("error")
+            except Exception as e:
+                record["error"] = str(e)
+        elif pending_path.exists():
+            record["status"] = "pending"
+            pending = read_pending(cell_dir)
+            if pending is None:
+                record["error"] = f"Unreadable {PENDING_FILE}"
+            else:
+                record["text"] = pending.get("text")
+                if is_orphaned(pending):
+                    record["status"] = "orphaned"
+                    record["error"] = f"Trainer process {pending.get('pid')} is gone"
+        else:
+            record["status"] = "missing_model"
+        return record
+
+    try:
+        # 🐢 torch is imported lazily: cells without a model are classified without it
+        from memory.mlp_core.mlp_decoder import reconstruct_from_saved_vector
+        token_ids = reconstruct_from_saved_vector(str(cell_dir))
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+        return record
+
+    text = decode_token_ids_to_text(token_ids)
+    if text.startswith(DECODE_ERROR_PREFIX):
+        record["status"] = "decode_error"
+        record["error"] = text
+    else:
+        record["text"] = text
+    return record
+
+
+def _reconstruct_batch(cell_dirs: List[Path]) -> List[Dict[str, Any]]:
+    return [reconstruct_cell(d) for d in cell_dirs]
+
+
+# -------------------- Streaming pipeline --------------------
+
+def iter_reconstructed(
+    cells_dirs: Optional[Sequence[Path]] = None,
+    batch_size: int = 32,
+    workers: int = 4
+) -> Iterator[Dict[str, Any]]:
+    """
+    Reconstruct all cells of a store in parallel batches, yielding records in cell order.
+
+    At most `workers` batches are in flight, so memory stays bounded by
+    workers * batch_size cells regardless of store size.
+
+    Args:
+        cells_dirs: Shard roots of the store (default: CELLS_DIRS).
+        batch_size: Cells per batch handed to a worker.
+        workers: Number of worker threads (torch releases the GIL during inference).
+    """
+    if batch_size < 1 or workers < 1:
+        raise ValueError("❌ batch_size and workers must be >= 1")
+
+    def batches() -> Iterator[List[Path]]:
+        batch: List[Path] = []
+        for d in iter_cell_dirs(cells_dirs):
+            batch.append(d)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for batch in batches():
+            in_flight.append(pool.submit(_reconstruct_batch, batch))
+            if len(in_flight) >= workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def export_cells(
+    out_path: Optional[Union[str, Path]],
+    cells_dirs: Optional[Sequence[Path]] = None,
+    batch_size: int = 32,
+    workers: int = 4
+) -> Dict[str, Any]:
+    """
+    Reconstruct every cell and write the results as JSONL.
+
+    Args:
+        out_path: Output JSONL file, or None to only verify without writing.
+        cells_dirs: Shard roots of the store (default: CELLS_DIRS).
+        batch_size: Cells per batch.
+        workers: Number of worker threads.
+
+    Returns:
+        dict: total, ok, pending (cells still being trained — not a failure),
+        failed (list of {"cell_id", "status", "error"}, including orphaned cells),
+        seconds and cells_per_sec.
+    """
+    total = 0
+    ok = 0
+    pending = 0
+    failed: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    out = open(out_path, "w", encoding="utf-8") if out_path is not None else None
+    try:
+        for record in iter_reconstructed(cells_dirs, batch_size=batch_size, workers=workers):
+            total += 1
+            if record["status"] == "ok":
+                ok += 1
+            elif record["status"] == "pending":
+                pending += 1
+            else:
+                failed.append({
+                    "cell_id": record["cell_id"],
+                    "status": record["status"],
+                    "error": record["error"],
+                })
+            if out is not None:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        "total": total,
+        "ok": ok,
+        "pending": pending,
+        "failed": failed,
+        "seconds": seconds,
+        "cells_per_sec": total / seconds if seconds > 0 else 0.0,
+    }
+
+
+__all__ = ["iter_cell_dirs", "reconstruct_cell", "iter_reconstructed", "export_cells"]
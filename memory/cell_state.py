@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+ReMemory: Training state of memory cells
+A cell whose model is not trained yet carries a pending marker (PENDING_FILE):
+
+    {"text": "...", "pid": 4242, "host": "worker-1"}
+
+`pid`/`host` identify the process that is training the cell. If that process is
+gone (crash, restart), the cell is orphaned: nobody will ever write its model.
+Recall and export report such cells as orphaned, and a learn queue can claim
+them with `claim_orphan` and train them again.
+
+Liveness can only be checked for owners on this host; cells owned by another
+host are always treated as live.
+"""
+
+import os
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: claims are not serialized across processes
+    fcntl = None
+
+# ✅ Use shared project paths (no hardcoded directory)
+from memory.common_paths import PENDING_FILE
+
+
+def pending_owner() -> Dict[str, Any]:
+    """Owner fields identifying the current process in a pending marker."""
+    return {"pid": os.getpid(), "host": socket.gethostname()}
+
+
+def _pid_alive(pid: int) -> bool:
+    """Return True if a process with this pid exists on this host."""
+    if os.name == "nt":  # signal 0 is not a probe on Windows — assume alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_pending(cell_dir: Path) -> Optional[Dict[str, Any]]:
+    """Return the pending marker of a cell, or None if there is none (or it is unreadable)."""
+    try:
+        with open(Path(cell_dir) / PENDING_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_orphaned(pending: Dict[str, Any]) -> bool:
+    """True if the process that owns this pending marker no longer exists."""
+    pid = pending.get("pid")
+    if pid is None:
+        return True
+    if pending.get("host") != socket.gethostname():
+        return False
+    return not _pid_alive(int(pid))
+
+
+def claim_orphan(cell_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Take over an orphaned cell: rewrite its pending marker with this process as owner.
+
+    The marker is flock-ed while it is checked and rewritten, so concurrent
+    recoverers never claim the same cell twice.
+
+    Returns:
+        The updated pending marker, or None if the cell is not orphaned (anymore).
+    """
+    path = Path(cell_dir) / PENDING_FILE
+    try:
+        f = open(path, "r+", encoding="utf-8")
+    except OSError:
+        return None
+    with f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None  # another recoverer holds it
+        try:
+            pending = json.load(f)
+        except ValueError:
+            return None
+        if not is_orphaned(pending):
+            return None
+        pending.update(pending_owner())
+        f.seek(0)
+        f.truncate()
+        json.dump(pending, f, ensure_ascii=False, indent=2)
+        f.flush()
+        return pending
+
+
+__all__ = ["pending_owner", "read_pending", "is_orphaned", "claim_orphan"]
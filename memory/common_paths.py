@@ -6,7 +6,9 @@ All other modules should import paths from here instead of hardcoding them.
 """
 
 from pathlib import Path
+from typing import List, Optional, Sequence, Union
 import os
+import zlib
 
 # 🚀 Project root directory (2 levels up from this file)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -15,5 +17,46 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 # Can be overridden by the REM_CELLS_DIR environment variable.
 CELLS_DIR = Path(os.getenv("REM_CELLS_DIR", PROJECT_ROOT / "memory_cells"))
 
-# ✅ Ensure the directory exists (optional but handy)
-CELLS_DIR.mkdir(parents=True, exist_ok=True)
+# 🗂️ Cell store roots (shards), e.g. one per volume.
+# REM_CELLS_DIRS takes several directories separated by os.pathsep (":" on Linux);
+# when set, its first entry also becomes CELLS_DIR. Default: the single CELLS_DIR.
+_cells_dirs_env = os.getenv("REM_CELLS_DIRS", "")
+CELLS_DIRS: List[Path] = [Path(p) for p in _cells_dirs_env.split(os.pathsep) if p] or [CELLS_DIR]
+CELLS_DIR = CELLS_DIRS[0]
+
+# ✅ Ensure the directories exist (optional but handy)
+for _d in CELLS_DIRS:
+    _d.mkdir(parents=True, exist_ok=True)
+
+# 📝 File holding the raw text of a cell whose model is still being trained.
+# Recall serves this text until the cell's model.pt is ready.
+PENDING_FILE = "pending_text.json"
+
+# ❌ Marker written instead of the model when training a cell failed ({"error": "..."}).
+FAILED_FILE = "training_failed.json"
+
+
+def resolve_cells_dirs(cells_dirs: Optional[Union[str, Path, Sequence[Union[str, Path]]]] = None) -> List[Path]:
+    """
+    Normalize a store specification to a list of shard roots.
+
+    Args:
+        cells_dirs: None (use CELLS_DIRS), a single directory, or a list of directories —
+            e.g. the roots of one tenant's store.
+    """
+    if cells_dirs is None:
+        return list(CELLS_DIRS)
+    if isinstance(cells_dirs, (str, Path)):
+        return [Path(cells_dirs)]
+    roots = [Path(d) for d in cells_dirs]
+    if not roots:
+        raise ValueError("❌ At least one cells directory is required.")
+    return roots
+
+
+def shard_for_cell(cell_id: str, cells_dirs: Sequence[Path]) -> Path:
+    """
+    Pick the shard root for a cell. Placement is a stable hash of the cell ID,
+    so the same ID always maps to the same root for a given list of roots.
+    """
+    return Path(cells_dirs[zlib.crc32(cell_id.encode("utf-8")) % len(cells_dirs)])
@@ -8,6 +8,7 @@ Lightweight semantic embedding utility with a fallback mechanism.
 
 Compatible API:
 - get_embedding_vector(text_or_tokens)  -> List[float]
+- preload_model()                       -> bool
 """
 
 from typing import List
@@ -37,6 +38,20 @@ def _ensure_model():
         return None
 
 
+def preload_model() -> bool:
+    """
+    Load the embedding model eagerly.
+
+    Call this in a pre-fork master process (e.g. gunicorn with preload_app) so
+    forked recall workers share the model weights copy-on-write instead of each
+    loading their own copy.
+
+    Returns:
+        True if the SentenceTransformer model is loaded, False if the fallback is used.
+    """
+    return _ensure_model() is not None
+
+
 def _fallback_hash(text: str, dim: int = 256) -> List[float]:
     """
     Create a deterministic hash-based vector representation as a fallback.
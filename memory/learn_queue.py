@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+ReMemory: Asynchronous learning queue
+Stores a memory cell immediately and trains its MLP on background worker threads,
+so the caller (e.g. an agent mid-conversation) does not wait for the training loop.
+
+Until training finishes the cell is already searchable: recall returns its pending text.
+Cells left pending by a process that died are picked up again by the next default
+queue (see `LearnQueue.recover_orphans`).
+
+Usage:
+    from memory.learn_queue import semantic_learn_async, learn_status, asemantic_learn
+
+    job = semantic_learn_async("summer 2024 in Paris", "I went to Paris with a friend and we...")
+    learn_status(job["cell_id"])   # {"status": "training", "epoch": 340, ...}
+
+    result = await asemantic_learn("summer 2024 in Paris", "I went to Paris ...")
+"""
+
+import os
+import asyncio
+import functools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union, Sequence, Tuple
+
+from memory.semantic_learn import (
+    _prepare_cell,
+    _train_prepared_cell,
+    _mark_cell_failed,
+    _find_orphaned_cells,
+    _reclaim_cell,
+)
+
+# Job states reported by `LearnQueue.status`
+QUEUED = "queued"
+TRAINING = "training"
+DONE = "done"
+FAILED = "failed"
+
+
+class LearnQueue:
+    """
+    Bounded pool of background trainers for memory cells.
+
+    Args:
+        workers: Number of training threads.
+        max_pending: Maximum number of queued + running jobs. When the limit is reached,
+            `submit` blocks (backpressure) or raises `queue.Full` after `timeout`.
+        keep_finished: Number of finished jobs whose status and result are kept;
+            older ones are forgotten so a long-lived process does not grow forever.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 16, keep_finished: int = 256):
+        if workers < 1:
+            raise ValueError("❌ workers must be >= 1")
+        if max_pending < 1:
+            raise ValueError("❌ max_pending must be >= 1")
+        if keep_finished < 0:
+            raise ValueError("❌ keep_finished must be >= 0")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._finished: "deque[str]" = deque()
+        self._keep_finished = keep_finished
+        self._active = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"rem-learn-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    # -------------------- Public API --------------------
+
+    def submit(
+        self,
+        keywords: Union[str, List[str]],
+        text: str,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        cells_dirs: Optional[Sequence[Path]] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a new memory cell now and queue its training.
+
+        Args:
+            keywords: A semantic signal (string or list of keywords).
+            text: The full memory text to encode.
+            block: Wait for a free slot when the queue is full.
+            timeout: Maximum seconds to wait for a slot (None = forever).
+            cells_dirs: Shard roots of the target store (default: CELLS_DIRS).
+
+        Returns:
+            dict: status snapshot of the new job (see `status`).
+
+        Raises:
+            queue.Full: If no slot became free (backpressure).
+            RuntimeError: If the queue has been shut down.
+        """
+        return self._submit(keywords, text, block, timeout, cells_dirs)[0]
+
+    def _submit(
+        self,
+        keywords: Union[str, List[str]],
+        text: str,
+        block: bool,
+        timeout: Optional[float],
+        cells_dirs: Optional[Sequence[Path]]
+    ) -> Tuple[Dict[str, Any], Future]:
+        """`submit` that also returns the job's future (it may finish and be forgotten at once)."""
+        # Fast path only — the authoritative check happens under the lock before enqueueing
+        if self._closed:
+            raise RuntimeError("❌ Learn queue is shut down.")
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            raise queue.Full("❌ Learn queue is full — training cannot keep up with ingest.")
+
+        try:
+            cell = _prepare_cell(keywords, text, cells_dirs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        return self._enqueue(cell)
+
+    def _enqueue(self, cell: Dict[str, Any]) -> Tuple[Dict[str, Any], Future]:
+        """Register a prepared cell (its slot already acquired) and queue its training."""
+        cell_id = cell["cell_id"]
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                # shutdown() won the race: its sentinels are queued, nobody would train this cell
+                self._slots.release()
+                _mark_cell_failed(cell["cells_dir"], cell_id, "Learn queue was shut down before training.")
+                raise RuntimeError("❌ Learn queue is shut down.")
+            self._jobs[cell_id] = {
+                "cell_id": cell_id,
+                "status": QUEUED,
+                "epoch": 0,
+                "max_epochs": None,
+                "loss": None,
+                "result": None,
+                "error": None,
+            }
+            self._futures[cell_id] = future
+            self._active += 1
+            snapshot = dict(self._jobs[cell_id])
+            self._queue.put(cell)
+        return snapshot, future
+
+    def recover_orphans(self, cells_dirs: Optional[Sequence[Path]] = None) -> List[str]:
+        """
+        Queue the training of cells left pending by a process that no longer exists.
+
+        Each orphan is claimed first (its pending marker gets this process as owner),
+        so two queues recovering the same store never train a cell twice.
+        Waits for free slots like a blocking `submit`.
+
+        Args:
+            cells_dirs: Shard roots to scan (default: CELLS_DIRS).
+
+        Returns:
+            list: IDs of the re-queued cells.
+        """
+        recovered = []
+        for cell_dir in _find_orphaned_cells(cells_dirs):
+            if self._closed:
+                break
+            self._slots.acquire()
+            try:
+                cell = _reclaim_cell(cell_dir)
+            except Exception as e:
+                self._slots.release()
+                print(f"⚠️ Could not recover {cell_dir.name}: {e}")
+                continue
+            if cell is None:  # not orphaned anymore, or claimed by another process
+                self._slots.release()
+                continue
+            try:
+                self._enqueue(cell)
+            except RuntimeError:
+                break  # shut down meanwhile; the cell was marked failed
+            recovered.append(cell["cell_id"])
+        if recovered:
+            print(f"🔁 Re-queued {len(recovered)} orphaned cell(s): {', '.join(recovered)}")
+        return recovered
+
+    def status(self, cell_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a snapshot of a job, or None if the ID is unknown
+        (or the job finished longer ago than the last `keep_finished` jobs).
+
+        Keys: cell_id, status (queued/training/done/failed), epoch, max_epochs,
+        loss, result (the `semantic_learn` result once done), error.
+        """
+        with self._lock:
+            job = self._jobs.get(cell_id)
+            return dict(job) if job is not None else None
+
+    def future(self, cell_id: str) -> Future:
+        """
+        Return the concurrent.futures.Future resolving to the job's training result.
+
+        Raises:
+            KeyError: If the ID is unknown or the finished job was already forgotten.
+        """
+        with self._lock:
+            return self._futures[cell_id]
+
+    def pending(self) -> int:
+        """Number of jobs that are queued or training."""
+        with self._lock:
+            return self._active
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs; workers exit after draining the queue."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                for _ in self._threads:
+                    self._queue.put(None)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    # -------------------- Worker --------------------
+
+    def _update(self, cell_id: str, **fields: Any) -> None:
+        with self._lock:
+            self._jobs[cell_id].update(fields)
+
+    def _finish(self, cell_id: str, **fields: Any) -> None:
+        """Record the final state of a job and forget the oldest finished jobs."""
+        with self._lock:
+            self._jobs[cell_id].update(fields)
+            self._active -= 1
+            self._finished.append(cell_id)
+            while len(self._finished) > self._keep_finished:
+                old = self._finished.popleft()
+                self._jobs.pop(old, None)
+                self._futures.pop(old, None)
+
+    def _worker(self) -> None:
+        while True:
+            cell = self._queue.get()
+            if cell is None:
+                return
+            # One broken job must never end the worker — later jobs would stay queued forever
+            try:
+                self._run_job(cell)
+            except Exception as e:
+                print(f"⚠️ Learn worker error on {cell.get('cell_id')}: {e}")
+
+    def _run_job(self, cell: Dict[str, Any]) -> None:
+        """Train one queued cell and resolve its future."""
+        cell_id = cell["cell_id"]
+        try:
+            future = self.future(cell_id)
+            # False if the caller cancelled (e.g. a cancelled asemantic_learn task).
+            # The cell is still trained so it does not stay pending; only the result is dropped.
+            notify = future.set_running_or_notify_cancel()
+            self._update(cell_id, status=TRAINING)
+
+            def on_progress(epoch: int, max_epochs: int, loss: float) -> None:
+                self._update(cell_id, epoch=epoch, max_epochs=max_epochs, loss=loss)
+
+            try:
+                result = _train_prepared_cell(cell, progress_callback=on_progress)
+            except Exception as e:
+                self._finish(cell_id, status=FAILED, error=str(e))
+                if notify:
+                    future.set_exception(e)
+            else:
+                self._finish(cell_id, status=DONE, result=result)
+                if notify:
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+# -------------------- Module-level default queue --------------------
+
+_default_queue: Optional[LearnQueue] = None
+_default_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    """A forked child has none of the parent's worker threads: it must build its own queue."""
+    global _default_queue, _default_lock
+    _default_queue = None
+    _default_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_learn_queue() -> LearnQueue:
+    """Return the process-wide learn queue, creating it on first use."""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = LearnQueue()
+            # Finish what a crashed process left pending, without delaying the first submit
+            threading.Thread(
+                target=_default_queue.recover_orphans, name="rem-learn-recover", daemon=True
+            ).start()
+        return _default_queue
+
+
+def semantic_learn_async(
+    keywords: Union[str, List[str]],
+    text: str,
+    block: bool = True,
+    timeout: Optional[float] = None,
+    cells_dirs: Optional[Sequence[Path]] = None
+) -> Dict[str, Any]:
+    """
+    Store a new memory cell immediately and train it in the background.
+
+    Args:
+        keywords: A semantic signal (string or list of keywords).
+        text: The full memory text to encode.
+        block: Wait for a free slot when the queue is full.
+        timeout: Maximum seconds to wait for a slot (None = forever).
+        cells_dirs: Shard roots of the target store (default: CELLS_DIRS).
+
+    Returns:
+        dict: job status snapshot; poll it with `learn_status(result["cell_id"])`.
+    """
+    return get_learn_queue().submit(keywords, text, block=block, timeout=timeout, cells_dirs=cells_dirs)
+
+
+def learn_status(cell_id: str) -> Optional[Dict[str, Any]]:
+    """Return the status of a background learning job started in this process."""
+    return get_learn_queue().status(cell_id)
+
+
+async def asemantic_learn(
+    keywords: Union[str, List[str]],
+    text: str,
+    cells_dirs: Optional[Sequence[Path]] = None
+) -> Dict[str, Any]:
+    """
+    Awaitable `semantic_learn`: stores the cell, trains it in the background
+    and resolves to the same result dict once training finishes.
+    """
+    learn_queue = get_learn_queue()
+    loop = asyncio.get_running_loop()
+    # Embedding + waiting for a free slot may block — keep it off the event loop
+    _, future = await loop.run_in_executor(
+        None, functools.partial(learn_queue._submit, keywords, text, True, None, cells_dirs)
+    )
+    return await asyncio.wrap_future(future)
+
+
+__all__ = [
+    "LearnQueue",
+    "get_learn_queue",
+    "semantic_learn_async",
+    "learn_status",
+    "asemantic_learn",
+]
@@ -6,6 +6,7 @@ The training continues until loss <= 1e-5 (precision target) or max_epochs is re
 
 import json
 from pathlib import Path
+from typing import Callable, Optional
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -21,7 +22,8 @@ def train_cell(
     save_dir: Path = CELLS_DIR,
     epochs: int = 2000,
     lr: float = 0.01,
-    target_loss: float = 1e-5
+    target_loss: float = 1e-5,
+    progress_callback: Optional[Callable[[int, int, float], None]] = None
 ) -> dict:
     """
     Train a small MLP to learn mapping from context_vector -> token_ids.
@@ -34,6 +36,7 @@ def train_cell(
         epochs: Maximum training epochs (safety limit).
         lr: Learning rate.
         target_loss: Stop training when loss <= this threshold.
+        progress_callback: Optional callable(epoch, max_epochs, loss) invoked after every epoch.
 
     Returns:
         dict: model metadata (path, epochs, final_loss).
@@ -67,6 +70,9 @@ def train_cell(
         actual_epochs = epoch + 1
         final_loss_value = float(loss.item())
 
+        if progress_callback is not None:
+            progress_callback(actual_epochs, epochs, final_loss_value)
+
         if final_loss_value <= target_loss:
             reached_target = True
             print(f"✅ Target loss reached ({final_loss_value:.8f}) at epoch {actual_epochs}")
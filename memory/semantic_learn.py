@@ -11,16 +11,22 @@ Usage:
 
 import os
 import json
+import threading
 from pathlib import Path
-from typing import List, Any, Union
+from typing import List, Any, Union, Dict, Tuple, Optional, Callable, Sequence
 
 # ✅ Import global paths (no hardcoded directories)
-from memory.common_paths import CELLS_DIR
+from memory.common_paths import (
+    CELLS_DIR, CELLS_DIRS, PENDING_FILE, FAILED_FILE, resolve_cells_dirs, shard_for_cell
+)
 
 # === Core imports ===
 from memory.generate_embedding_vector import get_embedding_vector
 from memory.codec.base64_codec import encode_text_to_token_ids
-from memory.mlp_core.mlp_trainer import train_cell
+from memory.shared_index import append_to_index
+from memory.cell_state import pending_owner, read_pending, is_orphaned, claim_orphan
+
+_cell_id_lock = threading.Lock()
 
 
 # ===== Utility functions =====
@@ -46,10 +52,12 @@ def _save_json(path: Path, data: Any) -> None:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
-def _next_cell_id() -> str:
-    """Generate the next cell ID like vec_0001, vec_0002, etc."""
-    _ensure_dir(CELLS_DIR)
-    existing = [d for d in os.listdir(CELLS_DIR) if d.startswith("vec_")]
+def _next_cell_id(cells_dirs: Sequence[Path]) -> str:
+    """Generate the next cell ID like vec_0001, vec_0002, etc. (unique across all shards)."""
+    existing = []
+    for root in cells_dirs:
+        _ensure_dir(root)
+        existing += [d for d in os.listdir(root) if d.startswith("vec_")]
     try:
         num = 1 + max([int(d.split("_")[1]) for d in existing], default=0)
     except Exception:
@@ -57,14 +65,46 @@ def _next_cell_id() -> str:
     return f"vec_{num:04d}"
 
 
-# ===== Main API =====
-def semantic_learn(keywords: Union[str, List[str]], text: str):
+def _create_cell_dir(cells_dirs: Sequence[Path]) -> Tuple[str, Path]:
     """
-    Train a new memory cell.
+    Reserve a new cell ID and create its directory in the shard chosen by `shard_for_cell`.
 
-    Args:
-        keywords: A semantic signal (string or list of keywords).
-        text: The full memory text to encode.
+    Safe to call from several threads at once: the lock serializes callers in
+    this process and the exclusive mkdir guards against other processes.
+    """
+    with _cell_id_lock:
+        while True:
+            cell_id = _next_cell_id(cells_dirs)
+            cell_dir = shard_for_cell(cell_id, cells_dirs) / cell_id
+            try:
+                cell_dir.mkdir()
+                return cell_id, cell_dir
+            except FileExistsError:
+                continue
+
+
+def _mark_cell_failed(cells_dir: Path, cell_id: str, error: str) -> None:
+    """Replace the pending text of a cell that will never be trained with a failure marker."""
+    cell_dir = Path(cells_dir) / cell_id
+    _save_json(cell_dir / FAILED_FILE, {"error": error})
+    (cell_dir / PENDING_FILE).unlink(missing_ok=True)
+
+
+# ===== Learning phases =====
+def _prepare_cell(
+    keywords: Union[str, List[str]],
+    text: str,
+    cells_dirs: Optional[Sequence[Path]] = None
+) -> Dict[str, Any]:
+    """
+    Create a new memory cell and make it searchable before training.
+
+    Stores the context vector and the pending text, then refreshes the shared index
+    of the shard the cell was placed in.
+
+    Returns:
+        dict: cell_id, cells_dir (shard root), context_vector and token_ids
+        needed by `_train_prepared_cell`.
     """
 
     if isinstance(keywords, str):
@@ -80,15 +120,94 @@ def semantic_learn(keywords: Union[str, List[str]], text: str):
     token_ids = encode_text_to_token_ids(text)
 
     # 3. Create a new memory cell directory
-    cell_id = _next_cell_id()
-    cell_dir = CELLS_DIR / cell_id
-    _ensure_dir(cell_dir)
+    cell_id, cell_dir = _create_cell_dir(resolve_cells_dirs(cells_dirs))
 
-    # 4. Save context vector
+    # 4. Save context vector and pending text (recall serves it until the model is trained)
+    _save_json(cell_dir / PENDING_FILE, {"text": text, **pending_owner()})
     _save_json(cell_dir / "context_vector.json", context_vector)
 
-    # 5. Train MLP to reconstruct text
-    train_result = train_cell(context_vector, token_ids, cell_id)
+    # 5. Add the cell to the shared index (only if the store uses one)
+    append_to_index(cell_dir.parent, cell_id, context_vector)
+
+    return {
+        "cell_id": cell_id,
+        "cells_dir": cell_dir.parent,
+        "context_vector": context_vector,
+        "token_ids": token_ids,
+    }
+
+
+def _find_orphaned_cells(cells_dirs: Optional[Sequence[Path]] = None) -> List[Path]:
+    """Directories of cells that are pending but whose trainer process is gone."""
+    orphans = []
+    for root in resolve_cells_dirs(cells_dirs):
+        if not root.exists():
+            continue
+        for d in sorted(os.listdir(root)):
+            cell_dir = root / d
+            if not d.startswith("vec_") or (cell_dir / "model_config.json").exists():
+                continue
+            pending = read_pending(cell_dir)
+            if pending is not None and is_orphaned(pending):
+                orphans.append(cell_dir)
+    return orphans
+
+
+def _reclaim_cell(cell_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Claim an orphaned cell for this process and rebuild what `_train_prepared_cell` needs.
+
+    Token IDs are re-encoded from the stored pending text.
+
+    Returns:
+        The prepared cell dict, or None if another process claimed it first.
+    """
+    pending = claim_orphan(cell_dir)
+    if pending is None:
+        return None
+    with open(cell_dir / "context_vector.json", "r", encoding="utf-8") as f:
+        context_vector = json.load(f)
+    return {
+        "cell_id": cell_dir.name,
+        "cells_dir": cell_dir.parent,
+        "context_vector": context_vector,
+        "token_ids": encode_text_to_token_ids(pending["text"]),
+    }
+
+
+def _train_prepared_cell(
+    cell: Dict[str, Any],
+    progress_callback: Optional[Callable[[int, int, float], None]] = None
+) -> Dict[str, Any]:
+    """
+    Train the MLP of a cell created by `_prepare_cell` and drop its pending text.
+
+    Returns:
+        dict: the same result as `semantic_learn`.
+    """
+    cell_id = cell["cell_id"]
+    cells_dir = cell["cells_dir"]
+    token_ids = cell["token_ids"]
+
+    # 🐢 torch is imported lazily: storing a cell and queueing it does not need it
+    from memory.mlp_core.mlp_trainer import train_cell
+
+    # 6. Train MLP to reconstruct text
+    try:
+        train_result = train_cell(
+            cell["context_vector"],
+            token_ids,
+            cell_id,
+            save_dir=cells_dir,
+            progress_callback=progress_callback,
+        )
+    except Exception as e:
+        # Recall and export must report the cell as failed, not as still training
+        _mark_cell_failed(cells_dir, cell_id, str(e))
+        raise
+
+    # 7. The model is saved — the cell no longer needs its pending text
+    (cells_dir / cell_id / PENDING_FILE).unlink(missing_ok=True)
 
     return {
         "cell_id": cell_id,
@@ -102,4 +221,22 @@ def semantic_learn(keywords: Union[str, List[str]], text: str):
     }
 
 
-__all__ = ["semantic_learn", "CELLS_DIR"]
+# ===== Main API =====
+def semantic_learn(
+    keywords: Union[str, List[str]],
+    text: str,
+    cells_dirs: Optional[Sequence[Path]] = None
+):
+    """
+    Train a new memory cell.
+
+    Args:
+        keywords: A semantic signal (string or list of keywords).
+        text: The full memory text to encode.
+        cells_dirs: Shard roots of the target store (default: CELLS_DIRS).
+    """
+    cell = _prepare_cell(keywords, text, cells_dirs)
+    return _train_prepared_cell(cell)
+
+
+__all__ = ["semantic_learn", "CELLS_DIR", "CELLS_DIRS"]
@@ -6,17 +6,37 @@ Finds the most relevant memory cells based on a semantic query and reconstructs
 
 import os
 import json
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Sequence
 
 import numpy as np
 
 from memory.generate_embedding_vector import get_embedding_vector
 from memory.mlp_core.mlp_decoder import reconstruct_token_ids
 from memory.codec.base64_codec import decode_token_ids_to_text
+from memory.shared_index import get_shared_index
 
 # ✅ Use shared project paths (no hardcoded directory)
-from memory.common_paths import CELLS_DIR
+from memory.common_paths import CELLS_DIRS, PENDING_FILE, FAILED_FILE, resolve_cells_dirs
+from memory.cell_state import read_pending, is_orphaned
+
+# 🧵 Shared thread pool for querying shards in parallel (created on first multi-shard recall)
+_shard_pool: Optional[ThreadPoolExecutor] = None
+_shard_pool_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    """A forked child inherits the pool object but none of its threads — start over."""
+    global _shard_pool, _shard_pool_lock
+    _shard_pool = None
+    _shard_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 # -------------------- Utilities --------------------
@@ -30,11 +50,68 @@ def _cosine(a: List[float], b: List[float]) -> float:
     return float(np.dot(a / np.linalg.norm(a), b / np.linalg.norm(b)))
 
 
+def _scan_cells(cells_dir: Path, query_vec: List[float]) -> List[Tuple[str, float]]:
+    """Score every cell in the store by reading its context vector from disk (best first)."""
+    scored: List[Tuple[str, float]] = []
+
+    # Compute cosine similarity between the query and each memory cell context vector
+    for d in os.listdir(cells_dir):
+        if not d.startswith("vec_"):
+            continue
+        cell_dir = cells_dir / d
+        context_file = cell_dir / "context_vector.json"
+        if not context_file.exists():
+            continue
+        try:
+            with open(context_file, "r", encoding="utf-8") as f:
+                vec = json.load(f)
+            score = _cosine(query_vec, vec)
+            scored.append((d, score))
+        except Exception:
+            continue
+
+    # Sort memory cells by similarity score
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def _search_shard(cells_dir: Path, query_vec: List[float], top_k: int) -> List[Tuple[str, float, Path]]:
+    """Top-k of one shard: (cell_id, score, shard root), via its shared index or a directory scan."""
+    # ⚡ Use the shared memory-mapped index when one is published, else scan the store
+    index = get_shared_index(cells_dir)
+    if index is not None:
+        scored = index.search(query_vec, top_k=top_k)
+    else:
+        scored = _scan_cells(cells_dir, query_vec)[:top_k]
+    return [(cid, score, cells_dir) for cid, score in scored]
+
+
+def _search_shards(roots: Sequence[Path], query_vec: List[float], top_k: int) -> List[Tuple[str, float, Path]]:
+    """Query all shards in parallel and merge their top-k lists into a global top-k (best first)."""
+    global _shard_pool
+    if len(roots) == 1:
+        return _search_shard(roots[0], query_vec, top_k)
+
+    with _shard_pool_lock:
+        if _shard_pool is None:
+            _shard_pool = ThreadPoolExecutor(thread_name_prefix="rem-recall")
+    futures = [_shard_pool.submit(_search_shard, root, query_vec, top_k) for root in roots]
+
+    merged: List[Tuple[str, float, Path]] = []
+    for f in futures:
+        try:
+            merged.extend(f.result())
+        except Exception as e:
+            print(f"⚠️ Shard search failed: {e}")
+    return heapq.nlargest(top_k, merged, key=lambda x: x[1])
+
+
 # -------------------- Main Recall API --------------------
 
 def semantic_recall_plain(
     query: str,
-    top_k: int = 3
+    top_k: int = 3,
+    cells_dirs: Optional[Sequence[Path]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Retrieve the most semantically similar memory cell(s) and reconstruct the stored text.
@@ -42,66 +119,73 @@ def semantic_recall_plain(
     Args:
         query: Natural language query or semantic signal.
         top_k: Number of top matching memory cells to return (for similarity distribution).
+        cells_dirs: Shard roots of the store to search (default: CELLS_DIRS).
 
     Returns:
         A dictionary containing similarity scores and reconstructed text from the best match.
+        If the best match is still being trained, its stored text is returned with "pending": True;
+        if its training failed, "failed" is True; if the process training it is gone,
+        "orphaned" is True (the stored text is still returned).
     """
     query_vec = get_embedding_vector(query)
     if query_vec is None:
         print("❌ Failed to compute embedding for the query.")
         return None
 
-    if not CELLS_DIR.exists():
-        print(f"❌ Memory directory not found: {CELLS_DIR}")
+    roots = [d for d in resolve_cells_dirs(cells_dirs) if d.exists()]
+    if not roots:
+        print(f"❌ Memory directory not found: {cells_dirs or CELLS_DIRS}")
         return None
 
-    scored: List[Tuple[str, float]] = []
-
-    # Compute cosine similarity between the query and each memory cell context vector
-    for d in os.listdir(CELLS_DIR):
-        if not d.startswith("vec_"):
-            continue
-        cell_dir = CELLS_DIR / d
-        context_file = cell_dir / "context_vector.json"
-        if not context_file.exists():
-            continue
-        try:
-            with open(context_file, "r", encoding="utf-8") as f:
-                vec = json.load(f)
-            score = _cosine(query_vec, vec)
-            scored.append((d, score))
-        except Exception:
-            continue
+    # 🔀 Fan out over all shards and merge per-shard top-k into a global top-k
+    scored = _search_shards(roots, query_vec, max(1, top_k))
 
     if not scored:
         print("⚠️ Memory is empty or contains no valid cells.")
         return None
 
-    # Sort memory cells by similarity score
-    scored.sort(key=lambda x: x[1], reverse=True)
-
     # Take top_k results for similarity distribution
     top_cells = scored[:top_k]
-    distribution = [{"cell_id": cid, "score": float(score)} for cid, score in top_cells]
+    distribution = [{"cell_id": cid, "score": float(score)} for cid, score, _ in top_cells]
 
     # ✅ Reconstruct the text from the most similar memory cell
-    top_cell_id, top_score = scored[0]
-    top_cell_dir = CELLS_DIR / top_cell_id
+    top_cell_id, top_score, top_root = scored[0]
+    top_cell_dir = top_root / top_cell_id
     context_path = top_cell_dir / "context_vector.json"
     model_path = top_cell_dir / "model.pt"
     config_path = top_cell_dir / "model_config.json"
+    pending_path = top_cell_dir / PENDING_FILE
+    failed_path = top_cell_dir / FAILED_FILE
 
     text = "[Reconstruction error]"
+    pending = False
+    failed = False
+    orphaned = False
     try:
-        with open(context_path, "r", encoding="utf-8") as f:
-            stored_vector = json.load(f)
-        token_ids = reconstruct_token_ids(
-            context_vector=stored_vector,
-            model_path=str(model_path),
-            config_path=str(config_path),
-            token_range=(0, 4095),
-        )
-        text = decode_token_ids_to_text(token_ids)
+        # ❌ Training failed: there is no model to reconstruct from
+        if failed_path.exists() and not config_path.exists():
+            with open(failed_path, "r", encoding="utf-8") as f:
+                error = json.load(f).get("error")
+            text = f"[Training failed]: {error}"
+            failed = True
+        # ⏳ Model still training: serve the stored text instead
+        elif pending_path.exists() and not config_path.exists():
+            marker = read_pending(top_cell_dir)
+            if marker is None:
+                raise ValueError(f"Unreadable {PENDING_FILE}")
+            text = marker["text"]
+            orphaned = is_orphaned(marker)
+            pending = not orphaned
+        else:
+            with open(context_path, "r", encoding="utf-8") as f:
+                stored_vector = json.load(f)
+            token_ids = reconstruct_token_ids(
+                context_vector=stored_vector,
+                model_path=str(model_path),
+                config_path=str(config_path),
+                token_range=(0, 4095),
+            )
+            text = decode_token_ids_to_text(token_ids)
     except Exception as e:
         print(f"⚠️ Reconstruction failed: {e}")
 
@@ -110,6 +194,9 @@ def semantic_recall_plain(
         "top_cell": {
             "cell_id": top_cell_id,
             "score": float(top_score),
-            "text": text
+            "text": text,
+            "pending": pending,
+            "failed": failed,
+            "orphaned": orphaned
         },
     }
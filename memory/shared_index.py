@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+ReMemory: Shared context-vector index
+Publishes all context vectors of a cell store as read-only matrices that many
+recall workers can memory-map, so N worker processes share a single copy in RAM.
+
+Layout (inside the cells directory):
+    _index/.lock                              -> flock held by publishers (cross-process)
+    _index/CURRENT                            -> name of the active generation, e.g. "gen_000003"
+    _index/gen_000003.json                    -> {"384": [["seg_<uuid>", 1000], ["seg_<uuid>", 1]]}
+    _index/segments/seg_<uuid>.ids.json       -> ["vec_0001", ...] cell IDs of the segment
+    _index/segments/seg_<uuid>.vectors.npy    -> float32 [n_cells, dim], L2-normalized rows
+    _index/segments/seg_<uuid>.norms.npy      -> float32 [n_cells], original vector norms
+
+A generation is a small manifest listing, per vector length, the immutable
+segments that hold its rows. `publish_index` compacts every vector length into
+one base segment; `append_to_index` only writes a one-row delta segment plus a
+new manifest, so adding a cell costs O(1) instead of rewriting the matrix.
+Trailing deltas are merged like a binary counter (a delta is folded into the one
+before it once it is at least as large), which keeps a vector length at
+O(log n) segments until the next publish compacts them again.
+
+Queries only touch the segments of their vector length and never copy rows out
+of the mappings. Every write swaps CURRENT atomically under the lock, so workers
+never see a half-written or outdated index; readers cache segments by name and
+only map the new ones when the generation changes.
+
+Usage:
+    from memory.shared_index import publish_index, get_shared_index
+
+    publish_index()                      # in the master / after training
+    index = get_shared_index()           # in each worker
+    if index is not None:
+        top = index.search(query_vec, top_k=3)
+"""
+
+import os
+import json
+import heapq
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple, FrozenSet
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: publishers are only serialized within one process
+    fcntl = None
+
+# ✅ Use shared project paths (no hardcoded directory)
+from memory.common_paths import CELLS_DIR
+
+INDEX_DIRNAME = "_index"
+SEGMENTS_DIRNAME = "segments"
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+GEN_PREFIX = "gen_"
+SEG_PREFIX = "seg_"
+
+# (ids, normalized vectors, norms) of the cells in one segment
+Segment = Tuple[List[str], np.ndarray, np.ndarray]
+
+# {dim: [[segment name, row count], ...]} — the content of a generation manifest
+Manifest = Dict[int, List[Tuple[str, int]]]
+
+# Serializes publishers in this process (flock serializes them across processes)
+_publish_lock = threading.Lock()
+
+
+# -------------------- Utilities --------------------
+
+def _index_root(cells_dir: Path) -> Path:
+    """Directory holding all published index generations."""
+    return Path(cells_dir) / INDEX_DIRNAME
+
+
+def _read_current(cells_dir: Path) -> Optional[str]:
+    """Return the name of the active generation, or None if nothing is published."""
+    try:
+        with open(_index_root(cells_dir) / CURRENT_FILE, "r", encoding="utf-8") as f:
+            gen = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return gen or None
+
+
+def _gen_number(name: str) -> int:
+    """Parse "gen_000003" / "gen_000003.json" -> 3 (unknown names sort first)."""
+    try:
+        return int(name[len(GEN_PREFIX):].split(".", 1)[0])
+    except ValueError:
+        return -1
+
+
+def _read_manifest(root: Path, gen: str) -> Manifest:
+    """Load the segment list of generation `gen`."""
+    with open(root / f"{gen}.json", "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return {int(dim): [(name, int(n)) for name, n in segs] for dim, segs in raw.items()}
+
+
+@contextmanager
+def _publish_guard(root: Path) -> Iterator[None]:
+    """Hold the in-process lock and an exclusive flock on `_index/.lock`."""
+    root.mkdir(parents=True, exist_ok=True)
+    with _publish_lock:
+        with open(root / LOCK_FILE, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _load_cell_vectors(cells_dir: Path) -> Tuple[List[str], List[List[float]]]:
+    """Read every readable context_vector.json in the store, sorted by cell ID."""
+    ids: List[str] = []
+    vectors: List[List[float]] = []
+    for d in sorted(os.listdir(cells_dir)):
+        if not d.startswith("vec_"):
+            continue
+        context_file = Path(cells_dir) / d / "context_vector.json"
+        if not context_file.exists():
+            continue
+        try:
+            with open(context_file, "r", encoding="utf-8") as f:
+                vec = json.load(f)
+        except Exception:
+            continue
+        ids.append(d)
+        vectors.append(vec)
+    return ids, vectors
+
+
+def _normalize(vec: List[float]) -> Tuple[np.ndarray, float]:
+    """Return the L2-normalized float32 row (zeros for a zero vector) and the original norm."""
+    row = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(row))
+    return (row / norm if norm > 0 else row), norm
+
+
+def _build_groups(ids: List[str], vectors: List[List[float]]) -> Dict[int, Segment]:
+    """Pack vectors into one normalized matrix per vector length."""
+    by_dim: Dict[int, Tuple[List[str], List[np.ndarray], List[float]]] = {}
+    for cell_id, vec in zip(ids, vectors):
+        if len(vec) == 0:
+            continue
+        row, norm = _normalize(vec)
+        group = by_dim.setdefault(len(vec), ([], [], []))
+        group[0].append(cell_id)
+        group[1].append(row)
+        group[2].append(norm)
+    return {
+        dim: (g_ids, np.stack(rows), np.asarray(norms, dtype=np.float32))
+        for dim, (g_ids, rows, norms) in by_dim.items()
+    }
+
+
+def _load_segment(root: Path, name: str) -> Segment:
+    """Map the arrays of one segment."""
+    seg_dir = root / SEGMENTS_DIRNAME
+    with open(seg_dir / f"{name}.ids.json", "r", encoding="utf-8") as f:
+        ids = json.load(f)
+    return (
+        ids,
+        np.load(seg_dir / f"{name}.vectors.npy", mmap_mode="r"),
+        np.load(seg_dir / f"{name}.norms.npy", mmap_mode="r"),
+    )
+
+
+# -------------------- Publishing --------------------
+
+def _write_segment(root: Path, segment: Segment) -> Tuple[str, int]:
+    """
+    Write an immutable segment under a fresh, never reused name.
+
+    Readers cache segments by name, so a name must never refer to other rows later.
+
+    Returns:
+        (segment name, row count) as listed in a manifest.
+    """
+    seg_dir = root / SEGMENTS_DIRNAME
+    seg_dir.mkdir(exist_ok=True)
+    name = f"{SEG_PREFIX}{uuid.uuid4().hex}"
+
+    ids, matrix, norms = segment
+    np.save(seg_dir / f"{name}.vectors.npy", matrix)
+    np.save(seg_dir / f"{name}.norms.npy", norms)
+    with open(seg_dir / f"{name}.ids.json", "w", encoding="utf-8") as f:
+        json.dump(ids, f, ensure_ascii=False)
+    return name, len(ids)
+
+
+def _write_generation(root: Path, manifest: Manifest, keep: int) -> str:
+    """
+    Write `manifest` as a new generation, make it CURRENT and drop old generations
+    together with the segments none of the remaining generations use.
+    The caller holds `_publish_guard(root)`.
+    """
+    existing = [_gen_number(d) for d in os.listdir(root) if d.startswith(GEN_PREFIX)]
+    gen = f"{GEN_PREFIX}{1 + max(existing, default=0):06d}"
+    with open(root / f"{gen}.json", "w", encoding="utf-8") as f:
+        json.dump({str(dim): segs for dim, segs in manifest.items()}, f, ensure_ascii=False)
+
+    # 🔁 Atomically switch workers to the new generation
+    tmp = root / f"{CURRENT_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(gen)
+    os.replace(tmp, root / CURRENT_FILE)
+
+    # 🧹 Drop old generations (never the one just made current)
+    gens = sorted(
+        (d[:-len(".json")] for d in os.listdir(root) if d.startswith(GEN_PREFIX) and d.endswith(".json")),
+        key=_gen_number,
+    )
+    kept = gens[-max(1, keep):]
+    for old in gens:
+        if old not in kept and old != gen:
+            try:
+                os.remove(root / f"{old}.json")
+            except FileNotFoundError:
+                pass
+
+    # 🧹 Drop segments no kept generation refers to (workers that still map them keep working)
+    used = {name for g in kept for segs in _read_manifest(root, g).values() for name, _ in segs}
+    seg_dir = root / SEGMENTS_DIRNAME
+    for d in os.listdir(seg_dir):
+        if d.startswith(SEG_PREFIX) and d.split(".", 1)[0] not in used:
+            try:
+                os.remove(seg_dir / d)
+            except FileNotFoundError:
+                pass
+
+    return gen
+
+
+def publish_index(cells_dir: Path = CELLS_DIR, keep: int = 2) -> str:
+    """
+    Build a new index generation from the cell store and make it active.
+
+    Every vector length is compacted into a single segment. The whole
+    snapshot -> write -> swap -> cleanup sequence runs under an exclusive lock,
+    so concurrent publishers (other threads or processes) can never activate an
+    older snapshot over a newer one.
+
+    Args:
+        cells_dir: Memory cells directory to index.
+        keep: Number of most recent generations to keep on disk. Older ones are
+            removed; workers that still map them keep working until they refresh.
+
+    Returns:
+        The name of the published generation.
+    """
+    cells_dir = Path(cells_dir)
+    root = _index_root(cells_dir)
+    with _publish_guard(root):
+        ids, vectors = _load_cell_vectors(cells_dir)
+        manifest = {
+            dim: [_write_segment(root, segment)]
+            for dim, segment in _build_groups(ids, vectors).items()
+        }
+        return _write_generation(root, manifest, keep)
+
+
+def append_to_index(
+    cells_dir: Path,
+    cell_id: str,
+    context_vector: List[float],
+    keep: int = 2
+) -> Optional[str]:
+    """
+    Publish a new generation that is the current one plus a single cell.
+
+    Unlike `publish_index`, the store is not rescanned and no existing matrix is
+    rewritten: the cell becomes a one-row delta segment. Trailing deltas of similar
+    size are merged (never into the base segment), so the work per append is
+    amortized O(log n) rows.
+
+    Returns:
+        The new generation name, or None if the store has no published index.
+    """
+    cells_dir = Path(cells_dir)
+    root = _index_root(cells_dir)
+    if _read_current(cells_dir) is None:
+        return None
+
+    with _publish_guard(root):
+        gen = _read_current(cells_dir)
+        if gen is None:
+            return None
+        dim = len(context_vector)
+        if dim == 0:
+            return gen
+
+        # The process-wide reader caches segments, so this only maps what changed
+        reader = _get_reader(cells_dir)
+        if not reader.refresh():
+            return None
+        if reader.contains(cell_id, dim):
+            return gen
+
+        manifest = {
+            d: [(name, len(seg[0])) for name, seg in segs] for d, segs in reader._groups.items()
+        }
+        row, norm = _normalize(context_vector)
+        segs = manifest.setdefault(dim, [])
+        segs.append(_write_segment(root, ([cell_id], row[None, :], np.asarray([norm], dtype=np.float32))))
+
+        # Binary-counter merge of trailing deltas (index 0 is the base, left to publish_index)
+        while len(segs) >= 3 and segs[-2][1] <= segs[-1][1]:
+            parts = [_load_segment(root, name) for name, _ in segs[-2:]]
+            merged = (
+                parts[0][0] + parts[1][0],
+                np.concatenate([parts[0][1], parts[1][1]]),
+                np.concatenate([parts[0][2], parts[1][2]]),
+            )
+            segs[-2:] = [_write_segment(root, merged)]
+
+        return _write_generation(root, manifest, keep)
+
+
+# -------------------- Worker side --------------------
+
+class SharedIndex:
+    """
+    Read-only, memory-mapped view of the published index of a cell store.
+
+    The arrays are opened with mmap_mode="r", so every process that attaches
+    shares the same page-cache pages. On each search the reader checks CURRENT
+    and transparently switches to a newer generation if one was published.
+
+    Args:
+        cells_dir: Memory cells directory whose index should be attached.
+    """
+
+    def __init__(self, cells_dir: Path = CELLS_DIR):
+        self.cells_dir = Path(cells_dir)
+        self.generation: Optional[str] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        # {dim: [(segment name, segment), ...]} — swapped as one object so threads never mix generations
+        self._groups: Dict[int, List[Tuple[str, Segment]]] = {}
+        # Cell ID sets for `contains`, built on first use (segments are immutable)
+        self._id_sets: Dict[str, FrozenSet[str]] = {}
+
+    def _attach(self, gen: str) -> None:
+        """Map the segments of generation `gen`, reusing those already mapped."""
+        root = _index_root(self.cells_dir)
+        mapped = {name: seg for segs in self._groups.values() for name, seg in segs}
+        groups = {
+            dim: [(name, mapped.get(name) or _load_segment(root, name)) for name, _ in segs]
+            for dim, segs in _read_manifest(root, gen).items()
+        }
+        self._groups = groups
+        live = {name for segs in groups.values() for name, _ in segs}
+        self._id_sets = {name: ids for name, ids in self._id_sets.items() if name in live}
+        self.generation = gen
+
+    def refresh(self) -> bool:
+        """
+        Attach to the active generation if it changed since the last call.
+
+        Returns:
+            True if an index is attached, False if nothing is published.
+        """
+        current = _index_root(self.cells_dir) / CURRENT_FILE
+        try:
+            st = os.stat(current)
+        except FileNotFoundError:
+            return False
+        stamp = (st.st_ino, st.st_mtime_ns)
+        if stamp == self._stamp:
+            return True
+
+        # CURRENT may move on between reading it and mapping the files — retry once
+        for _ in range(2):
+            gen = _read_current(self.cells_dir)
+            if gen is None:
+                break
+            if gen == self.generation:
+                self._stamp = stamp
+                return True
+            try:
+                self._attach(gen)
+                self._stamp = stamp
+                return True
+            except FileNotFoundError:
+                continue
+        return self.generation is not None
+
+    def contains(self, cell_id: str, dim: int) -> bool:
+        """True if the attached generation indexes `cell_id` with vector length `dim`."""
+        for name, segment in self._groups.get(dim, []):
+            ids = self._id_sets.get(name)
+            if ids is None:
+                ids = self._id_sets[name] = frozenset(segment[0])
+            if cell_id in ids:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return sum(len(seg[0]) for segs in self._groups.values() for _, seg in segs)
+
+    def search(self, query_vec: List[float], top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Rank indexed cells by cosine similarity to the query.
+
+        Only the segments of the query's vector length are read, directly from
+        the mappings (no per-query copy of the index).
+
+        Args:
+            query_vec: Query embedding.
+            top_k: Number of best matches to return.
+
+        Returns:
+            A list of (cell_id, score) pairs, best first. Cells whose vector length
+            differs from the query are skipped; zero vectors score -1.0.
+        """
+        self.refresh()
+        segments = self._groups.get(len(query_vec))
+        if not segments or top_k <= 0:
+            return []
+
+        q, q_norm = _normalize(query_vec)
+        candidates: List[Tuple[str, float]] = []
+        for _, (ids, vectors, norms) in segments:
+            if q_norm == 0:
+                scores = np.full(len(ids), -1.0, dtype=np.float32)
+            else:
+                scores = vectors @ q
+                scores[norms == 0] = -1.0
+
+            k = min(top_k, len(ids))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            candidates.extend((ids[i], float(scores[i])) for i in best)
+
+        # 🔀 Merge per-segment top-k (segments in manifest order, so ties stay stable)
+        return heapq.nlargest(top_k, candidates, key=lambda x: x[1])
+
+
+_readers: Dict[str, SharedIndex] = {}
+
+
+def _get_reader(cells_dir: Path) -> SharedIndex:
+    """Return this process's reader for the store, attached or not."""
+    key = str(Path(cells_dir).resolve())
+    reader = _readers.get(key)
+    if reader is None:
+        reader = SharedIndex(cells_dir)
+        _readers[key] = reader
+    return reader
+
+
+def get_shared_index(cells_dir: Path = CELLS_DIR) -> Optional[SharedIndex]:
+    """
+    Return this process's reader for the store's index, or None if no index is published.
+    """
+    reader = _get_reader(cells_dir)
+    return reader if reader.refresh() else None
+
+
+def _reset_after_fork() -> None:
+    """
+    Give a forked child its own readers and publish lock: the parent's may be
+    mid-refresh or held by a thread that does not exist in the child.
+    """
+    global _readers, _publish_lock
+    _readers = {}
+    _publish_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+__all__ = ["publish_index", "append_to_index", "SharedIndex", "get_shared_index"]
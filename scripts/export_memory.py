@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ReMemory Export CLI
+Reconstructs every memory cell, writes the texts to JSONL and reports cells that fail to decode.
+"""
+
+import sys
+from pathlib import Path
+import argparse
+
+# 💡 Add project root to sys.path for module imports
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from memory.common_paths import CELLS_DIRS
+from memory.bulk_export import export_cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ReMemory: bulk reconstruction / export")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Output JSONL file (default: verify only, write nothing)",
+    )
+    parser.add_argument(
+        "--cells_dirs",
+        type=Path,
+        nargs="+",
+        default=CELLS_DIRS,
+        help="Memory cells directories / shard roots (default: REM_CELLS_DIRS or REM_CELLS_DIR)",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=32,
+        help="Cells per batch (default: 32)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Parallel worker threads (default: 4)",
+    )
+    args = parser.parse_args()
+
+    # 🔁 Reconstruct the whole store
+    summary = export_cells(
+        out_path=args.out,
+        cells_dirs=args.cells_dirs,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    print(f"✅ Reconstructed {summary['ok']}/{summary['total']} cells")
+    if summary["pending"]:
+        print(f"⏳ {summary['pending']} cell(s) still being trained (exported with their stored text)")
+    print(f"⚡ {summary['cells_per_sec']:.1f} cells/s ({summary['seconds']:.2f} s)")
+    if args.out is not None:
+        print(f"💾 Written to {args.out}")
+
+    # ⚠️ Report cells that could not be decoded
+    if summary["failed"]:
+        print(f"\n⚠️ {len(summary['failed'])} cell(s) failed:")
+        for f in summary["failed"]:
+            reason = f" — {f['error']}" if f["error"] else ""
+            print(f"   - {f['cell_id']}: {f['status']}{reason}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ReMemory Index Publisher
+Builds a new shared context-vector index generation so recall workers can memory-map it.
+"""
+
+import sys
+from pathlib import Path
+import argparse
+
+# 💡 Add project root to sys.path for module imports
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from memory.common_paths import CELLS_DIRS
+from memory.shared_index import publish_index, SharedIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ReMemory: publish shared recall index")
+    parser.add_argument(
+        "--cells_dirs",
+        type=Path,
+        nargs="+",
+        default=CELLS_DIRS,
+        help="Memory cells directories / shard roots to index (default: REM_CELLS_DIRS or REM_CELLS_DIR)",
+    )
+    args = parser.parse_args()
+
+    # 📦 Build and activate a new generation in every shard (each shard has its own index)
+    for cells_dir in args.cells_dirs:
+        gen = publish_index(cells_dir)
+
+        index = SharedIndex(cells_dir)
+        index.refresh()
+        print(f"✅ Published {gen} with {len(index)} cells in {cells_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -48,7 +48,14 @@ def main():
     print("\n🔎 Best match:")
     print(f"📁 ID: {top['cell_id']}")
     print(f"📈 Similarity: {top['score']:.4f}\n")
-    print("🧠 Reconstructed text:\n")
+    if top.get("failed"):
+        print("❌ Training of this memory failed:\n")
+    elif top.get("orphaned"):
+        print("⚠️ Training of this memory was interrupted (it will be retrained) — showing stored text:\n")
+    elif top.get("pending"):
+        print("⏳ Memory is still being trained — showing stored text:\n")
+    else:
+        print("🧠 Reconstructed text:\n")
     print(top["text"])
 
     # 📊 Show similarity distribution
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Tests for memory/bulk_export.py status classification (no torch required)."""
+
+import json
+import subprocess
+import sys
+
+from memory.bulk_export import export_cells, reconstruct_cell
+from memory.cell_state import pending_owner
+from memory.common_paths import FAILED_FILE, PENDING_FILE, PROJECT_ROOT
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_vec_0007_is_missing_model():
+    # The shipped vec_0007 has a context vector and config, but no model.pt
+    record = reconstruct_cell(PROJECT_ROOT / "memory_cells" / "vec_0007")
+    assert record["cell_id"] == "vec_0007"
+    assert record["status"] == "missing_model"
+    assert record["text"] is None
+    assert record["loss"] is not None
+
+
+def test_pending_failed_and_missing_vector(tmp_path):
+    pending = tmp_path / "vec_0001"
+    pending.mkdir()
+    _write_json(pending / "context_vector.json", [1.0])
+    _write_json(pending / PENDING_FILE, {"text": "hello", **pending_owner()})
+
+    failed = tmp_path / "vec_0002"
+    failed.mkdir()
+    _write_json(failed / "context_vector.json", [1.0])
+    _write_json(failed / FAILED_FILE, {"error": "boom"})
+
+    (tmp_path / "vec_0003").mkdir()
+
+    assert reconstruct_cell(pending)["status"] == "pending"
+    assert reconstruct_cell(pending)["text"] == "hello"
+    assert reconstruct_cell(failed)["status"] == "failed"
+    assert reconstruct_cell(failed)["error"] == "boom"
+    assert reconstruct_cell(tmp_path / "vec_0003")["status"] == "missing_vector"
+
+
+def test_export_counts_pending_separately(tmp_path):
+    pending = tmp_path / "vec_0001"
+    pending.mkdir()
+    _write_json(pending / "context_vector.json", [1.0])
+    _write_json(pending / PENDING_FILE, {"text": "hello", **pending_owner()})
+    (tmp_path / "vec_0002").mkdir()
+
+    out = tmp_path / "export.jsonl"
+    summary = export_cells(out, cells_dirs=[tmp_path], batch_size=1, workers=2)
+
+    assert summary["total"] == 2
+    assert summary["pending"] == 1
+    assert [f["cell_id"] for f in summary["failed"]] == ["vec_0002"]
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["cell_id"] for r in lines] == ["vec_0001", "vec_0002"]
+
+
+def test_pending_cell_of_dead_process_is_orphaned(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    orphan = tmp_path / "vec_0001"
+    orphan.mkdir()
+    _write_json(orphan / "context_vector.json", [1.0])
+    _write_json(orphan / PENDING_FILE, {"text": "hello", **pending_owner(), "pid": dead.pid})
+
+    record = reconstruct_cell(orphan)
+    assert record["status"] == "orphaned"
+    assert record["text"] == "hello"
+
+    summary = export_cells(None, cells_dirs=[tmp_path])
+    assert summary["pending"] == 0
+    assert [f["status"] for f in summary["failed"]] == ["orphaned"]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Tests for memory/common_paths.py."""
+
+from pathlib import Path
+
+import pytest
+
+from memory.common_paths import CELLS_DIRS, resolve_cells_dirs, shard_for_cell
+
+
+def test_shard_for_cell_is_stable():
+    roots = [Path("/a"), Path("/b"), Path("/c")]
+    placement = {f"vec_{i:04d}": shard_for_cell(f"vec_{i:04d}", roots) for i in range(1, 301)}
+
+    # Same ID -> same root, every time
+    assert all(shard_for_cell(cid, roots) == root for cid, root in placement.items())
+    # Fixed values: placement must not change between releases
+    assert shard_for_cell("vec_0001", roots) == Path("/a")
+    assert shard_for_cell("vec_0002", roots) == Path("/b")
+    # All shards are used
+    assert set(placement.values()) == set(roots)
+
+
+def test_single_root_gets_everything():
+    assert shard_for_cell("vec_0042", [Path("/only")]) == Path("/only")
+
+
+def test_resolve_cells_dirs():
+    assert resolve_cells_dirs() == CELLS_DIRS
+    assert resolve_cells_dirs("/x") == [Path("/x")]
+    assert resolve_cells_dirs(["/x", Path("/y")]) == [Path("/x"), Path("/y")]
+    with pytest.raises(ValueError):
+        resolve_cells_dirs([])
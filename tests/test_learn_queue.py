@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Tests for memory/learn_queue.py with the learning phases monkeypatched (no torch required)."""
+
+import asyncio
+import itertools
+import json
+import queue
+import threading
+
+import pytest
+
+import memory.learn_queue as learn_queue
+from memory.cell_state import read_pending
+from memory.common_paths import PENDING_FILE
+from memory.learn_queue import LearnQueue, DONE, FAILED
+
+
+@pytest.fixture
+def fake_learning(monkeypatch, tmp_path):
+    """Replace the prepare/train phases; training waits until `release` is set."""
+    counter = itertools.count(1)
+    release = threading.Event()
+
+    def prepare(keywords, text, cells_dirs=None):
+        return {"cell_id": f"vec_{next(counter):04d}", "cells_dir": tmp_path, "text": text}
+
+    def train(cell, progress_callback=None):
+        release.wait(5)
+        if cell.get("text") == "boom":
+            raise RuntimeError("training exploded")
+        progress_callback(1, 1, 0.0)
+        return {"cell_id": cell["cell_id"]}
+
+    monkeypatch.setattr(learn_queue, "_prepare_cell", prepare)
+    monkeypatch.setattr(learn_queue, "_train_prepared_cell", train)
+    monkeypatch.setattr(learn_queue, "_mark_cell_failed", lambda *a: None)
+    return release
+
+
+def test_backpressure_raises_queue_full(fake_learning):
+    q = LearnQueue(workers=1, max_pending=2)
+    try:
+        q.submit("a", "text")
+        q.submit("b", "text")
+        with pytest.raises(queue.Full):
+            q.submit("c", "text", timeout=0.05)
+        with pytest.raises(queue.Full):
+            q.submit("c", "text", block=False)
+        assert q.pending() == 2
+
+        fake_learning.set()
+        q.future("vec_0002").result(timeout=5)
+        q.submit("c", "text", timeout=5)  # a slot is free again
+    finally:
+        fake_learning.set()
+        q.shutdown()
+
+
+def test_status_result_and_failure(fake_learning):
+    fake_learning.set()
+    q = LearnQueue(workers=1)
+    try:
+        ok = q.submit("a", "text")
+        bad = q.submit("b", "boom")
+        assert q.future(ok["cell_id"]).result(timeout=5) == {"cell_id": ok["cell_id"]}
+        with pytest.raises(RuntimeError):
+            q.future(bad["cell_id"]).result(timeout=5)
+
+        assert q.status(ok["cell_id"])["status"] == DONE
+        assert q.status(ok["cell_id"])["epoch"] == 1
+        assert q.status(bad["cell_id"])["status"] == FAILED
+        assert q.status(bad["cell_id"])["error"] == "training exploded"
+        assert q.pending() == 0
+    finally:
+        q.shutdown()
+
+
+def test_finished_history_is_bounded(fake_learning):
+    fake_learning.set()
+    q = LearnQueue(workers=1, keep_finished=2)
+    try:
+        jobs = [q.submit("k", "text") for _ in range(5)]
+        q.future(jobs[-1]["cell_id"]).result(timeout=5)
+        q.shutdown()
+        assert q.status(jobs[0]["cell_id"]) is None
+        assert q.status(jobs[-1]["cell_id"])["status"] == DONE
+        assert len(q._jobs) == 2 and len(q._futures) == 2
+    finally:
+        q.shutdown()
+
+
+def test_submit_after_shutdown_is_rejected(fake_learning):
+    q = LearnQueue(workers=1)
+    q.shutdown()
+    with pytest.raises(RuntimeError):
+        q.submit("a", "text")
+
+
+def test_asemantic_learn(fake_learning, monkeypatch):
+    fake_learning.set()
+    q = LearnQueue(workers=1)
+    monkeypatch.setattr(learn_queue, "_default_queue", q)
+    try:
+        result = asyncio.run(learn_queue.asemantic_learn("a", "text"))
+        assert result == {"cell_id": "vec_0001"}
+    finally:
+        q.shutdown()
+
+
+def test_cancelled_asemantic_learn_keeps_worker_alive(fake_learning, monkeypatch):
+    q = LearnQueue(workers=1)
+    monkeypatch.setattr(learn_queue, "_default_queue", q)
+    try:
+        q.submit("blocker", "text")  # occupies the only worker until `release` is set
+
+        async def cancel_while_queued():
+            task = asyncio.ensure_future(learn_queue.asemantic_learn("a", "text"))
+            while q.pending() < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_while_queued())
+        fake_learning.set()
+
+        # The cancelled job is still trained, and the worker survives to take the next one
+        follow_up = q.submit("b", "text")
+        assert q.future(follow_up["cell_id"]).result(timeout=5) == {"cell_id": follow_up["cell_id"]}
+        assert q.status("vec_0002")["status"] == DONE
+        assert all(t.is_alive() for t in q._threads)
+    finally:
+        fake_learning.set()
+        q.shutdown()
+
+
+def test_recover_orphans_requeues_cells_without_owner(fake_learning, tmp_path):
+    fake_learning.set()
+    store = tmp_path / "store"
+    for cell_id, marker in [
+        ("vec_0001", {"text": "orphan"}),  # no owner: left by a crashed process
+        ("vec_0002", {"text": "live", "pid": 1, "host": "elsewhere"}),  # other host: treated as live
+    ]:
+        cell_dir = store / cell_id
+        cell_dir.mkdir(parents=True)
+        (cell_dir / "context_vector.json").write_text("[1.0]", encoding="utf-8")
+        (cell_dir / PENDING_FILE).write_text(json.dumps(marker), encoding="utf-8")
+
+    q = LearnQueue(workers=1)
+    try:
+        assert q.recover_orphans([store]) == ["vec_0001"]
+        assert q.future("vec_0001").result(timeout=5) == {"cell_id": "vec_0001"}
+        assert read_pending(store / "vec_0001")["pid"] is not None  # claimed by this process
+        assert q.recover_orphans([store]) == []  # our own claim is live
+    finally:
+        q.shutdown()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Tests for memory/shared_index.py (no torch required)."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import memory.shared_index as shared_index
+
+from memory.shared_index import (
+    SharedIndex,
+    append_to_index,
+    get_shared_index,
+    publish_index,
+    _read_current,
+    _read_manifest,
+)
+
+
+def _write_cell(cells_dir, cell_id, vec):
+    cell_dir = cells_dir / cell_id
+    cell_dir.mkdir(parents=True)
+    with open(cell_dir / "context_vector.json", "w", encoding="utf-8") as f:
+        json.dump(vec, f)
+
+
+def _cosine_scan(vectors, query):
+    """Reference ranking, same semantics as semantic_recall._cosine."""
+    q = np.asarray(query, dtype=np.float32)
+    scored = []
+    for cell_id, vec in vectors.items():
+        v = np.asarray(vec, dtype=np.float32)
+        if len(v) != len(q):
+            continue
+        if np.linalg.norm(v) == 0 or np.linalg.norm(q) == 0:
+            scored.append((cell_id, -1.0))
+        else:
+            scored.append((cell_id, float(np.dot(v / np.linalg.norm(v), q / np.linalg.norm(q)))))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def test_search_matches_cosine_scan(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = {f"vec_{i:04d}": rng.normal(size=16).tolist() for i in range(1, 21)}
+    vectors["vec_0021"] = [0.0] * 16      # zero vector scores -1.0
+    vectors["vec_0022"] = [1.0, 2.0, 3.0]  # other length is never returned for a 16-dim query
+    for cell_id, vec in vectors.items():
+        _write_cell(tmp_path, cell_id, vec)
+
+    publish_index(tmp_path)
+    index = SharedIndex(tmp_path)
+    query = rng.normal(size=16).tolist()
+
+    expected = _cosine_scan(vectors, query)
+    got = index.search(query, top_k=len(vectors))
+
+    assert len(index) == len(vectors)
+    assert [cid for cid, _ in got] == [cid for cid, _ in expected]
+    np.testing.assert_allclose([s for _, s in got], [s for _, s in expected], atol=1e-5)
+    assert index.search(query, top_k=3) == got[:3]
+    assert index.search([1.0, 2.0, 3.0], top_k=5)[0][0] == "vec_0022"
+
+
+def test_reader_reattaches_to_new_generation(tmp_path):
+    _write_cell(tmp_path, "vec_0001", [1.0, 0.0])
+    gen1 = publish_index(tmp_path)
+
+    index = get_shared_index(tmp_path)
+    assert index is not None and index.generation == gen1
+    assert index.search([0.0, 1.0], top_k=5) == [("vec_0001", 0.0)]
+
+    _write_cell(tmp_path, "vec_0002", [0.0, 1.0])
+    gen2 = publish_index(tmp_path)
+    assert gen2 != gen1
+
+    # The next search notices the new CURRENT and switches generations
+    assert index.search([0.0, 1.0], top_k=1) == [("vec_0002", 1.0)]
+    assert index.generation == gen2
+
+
+def test_publish_keeps_current_and_drops_old_generations(tmp_path):
+    _write_cell(tmp_path, "vec_0001", [1.0, 0.0])
+    gens = [publish_index(tmp_path, keep=2) for _ in range(4)]
+
+    on_disk = sorted(d for d in os.listdir(tmp_path / "_index") if d.startswith("gen_"))
+    assert on_disk == [f"{g}.json" for g in gens[-2:]]
+    assert _read_current(tmp_path) == gens[-1]
+    # Only the segments of the two kept generations remain
+    assert len(os.listdir(tmp_path / "_index" / "segments")) == 2 * 3
+
+
+def test_append_to_index_adds_one_row(tmp_path):
+    _write_cell(tmp_path, "vec_0001", [1.0, 0.0])
+    assert append_to_index(tmp_path, "vec_0002", [0.0, 1.0]) is None  # nothing published yet
+
+    gen1 = publish_index(tmp_path)
+    gen2 = append_to_index(tmp_path, "vec_0002", [0.0, 1.0])
+    assert gen2 != gen1
+    assert append_to_index(tmp_path, "vec_0002", [0.0, 1.0]) == gen2  # already indexed
+
+    index = SharedIndex(tmp_path)
+    assert index.search([0.0, 1.0], top_k=2) == [("vec_0002", 1.0), ("vec_0001", 0.0)]
+
+
+def test_no_index_published(tmp_path):
+    _write_cell(tmp_path, "vec_0001", [1.0, 0.0])
+    assert get_shared_index(tmp_path) is None
+
+
+def test_appends_are_delta_segments_compacted_by_publish(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = {"vec_0001": rng.normal(size=8).tolist()}
+    _write_cell(tmp_path, "vec_0001", vectors["vec_0001"])
+    publish_index(tmp_path)
+    base = _read_manifest(tmp_path / "_index", _read_current(tmp_path))[8][0]
+
+    for i in range(2, 101):
+        cell_id = f"vec_{i:04d}"
+        vectors[cell_id] = rng.normal(size=8).tolist()
+        _write_cell(tmp_path, cell_id, vectors[cell_id])
+        append_to_index(tmp_path, cell_id, vectors[cell_id])
+
+    # The base segment is never rewritten; 99 appends collapse into O(log n) deltas
+    segs = _read_manifest(tmp_path / "_index", _read_current(tmp_path))[8]
+    assert segs[0] == base
+    assert len(segs) <= 1 + 7
+    assert sum(n for _, n in segs) == 100
+
+    query = rng.normal(size=8).tolist()
+    expected = _cosine_scan(vectors, query)
+    index = SharedIndex(tmp_path)
+    assert index.refresh()
+    got = index.search(query, top_k=10)
+    assert [cid for cid, _ in got] == [cid for cid, _ in expected[:10]]
+    assert index.contains("vec_0100", 8) and not index.contains("vec_0100", 3)
+
+    publish_index(tmp_path, keep=1)
+    assert len(_read_manifest(tmp_path / "_index", _read_current(tmp_path))[8]) == 1
+    assert len(os.listdir(tmp_path / "_index" / "segments")) == 3
+    assert index.search(query, top_k=10) == got
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_fresh_readers(tmp_path):
+    _write_cell(tmp_path, "vec_0001", [1.0, 0.0])
+    publish_index(tmp_path)
+    parent_reader = get_shared_index(tmp_path)
+
+    pid = os.fork()
+    if pid == 0:
+        ok = (
+            not shared_index._readers
+            and get_shared_index(tmp_path) is not parent_reader
+            and shared_index._publish_lock.acquire(blocking=False)
+        )
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert get_shared_index(tmp_path) is parent_reader